@@ -7,7 +7,60 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import accumulate, chain, compress
+from operator import and_
 import json
+import hashlib
+import math
+
+# Threads given to each FFmpeg process when several run side by side
+FFMPEG_THREADS_PER_JOB = 2
+
+# Analysis runs on a small copy of each frame. Area averaging preserves the
+# mean, so luma-only passes use a thumbnail; edge statistics keep a little
+# more detail, and OCR needs more still
+ANALYSIS_WIDTH = 176
+EDGE_ANALYSIS_WIDTH = 320
+OCR_WIDTH = 640
+
+# Sampled frames whose spatial information (siti) is below this are close to
+# uniform, e.g. black cards between credits, and cannot contain text
+OCR_MIN_SPATIAL_INFO = 2
+
+# Audio levels are measured over windows of this many samples per second of
+# analysis sampling; exact for 48 kHz tracks and close enough for 44.1 kHz,
+# since audio and video are joined by timestamp
+NOMINAL_AUDIO_RATE = 48000
+
+# Seconds before each scene start searched for the keyframe a stream copy
+# cuts on; the seek that starts each read lands on a keyframe at or before
+# that point, so longer GOPs are still covered
+KEYFRAME_LOOKBACK = 10
+
+# Only text regions starting in the first 10% or last 15% of the video are
+# treated as credits
+OPENING_CREDITS_FRACTION = 0.1
+CLOSING_CREDITS_FRACTION = 0.85
+
+# Encoder options for each --frame-format; JPEG and WebP write a fraction of
+# the bytes PNG does for the same frame
+FRAME_CODEC_ARGS = {
+    'jpg': ['-q:v', '2'],
+    'webp': ['-c:v', 'libwebp', '-quality', '85'],
+    'png': [],
+}
+
+# Above this many scenes a single FFmpeg command line with one output (or
+# filter branch) per scene gets unwieldy, so --single-pass falls back to per-scene
+MAX_SINGLE_PASS_SCENES = 100
+
+# Once scenes cover this fraction of the video, decoding it once is cheaper
+# than starting an FFmpeg process and seeking for every scene
+SINGLE_PASS_COVERAGE = 0.3
 
 # Preset configurations for different detection sensitivities
 PRESETS = {
@@ -63,7 +116,8 @@ PRESETS = {
 
 def get_preset_config(preset_name):
     """Get configuration for a preset"""
-    return PRESETS.get(preset_name.lower())
+    # Names come from argparse choices, so they already match the PRESETS keys
+    return PRESETS.get(preset_name)
 
 def list_presets():
     """Return formatted list of available presets"""
@@ -120,21 +174,70 @@ def run_ffmpeg(cmd, description="Running FFmpeg"):
         log(f"FFmpeg error: {e.stderr}")
         raise
 
+def hwaccel_args(hwaccel):
+    """Input options decoding with the given hardware accelerator (software decoding if None)"""
+    # Without -hwaccel_output_format, decoded frames are copied back to system
+    # memory, so the CPU filters after the decoder keep working unchanged
+    return ['-hwaccel', hwaccel] if hwaccel else []
+
+def decode_args(hwaccel=None, gpu_decode=False):
+    """Input options for an analysis decode, keeping frames on the GPU with gpu_decode"""
+    if gpu_decode:
+        return ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+    return hwaccel_args(hwaccel)
+
+def cuda_decode_available():
+    """Check whether FFmpeg can open a CUDA device for decoding"""
+    # -hwaccels only lists what the build supports, so a device is actually
+    # opened to find out whether a usable NVIDIA GPU is present
+    cmd = ['ffmpeg', '-v', 'error', '-init_hw_device', 'cuda',
+           '-f', 'lavfi', '-i', 'nullsrc', '-frames:v', '1', '-f', 'null', '-']
+    try:
+        return subprocess.run(cmd, capture_output=True).returncode == 0
+    except OSError:
+        return False
+
+def video_encoder_args(quality, hwenc=None):
+    """Video encoder options for extracted segments, optionally using a hardware H.264 encoder"""
+    if hwenc == 'nvenc':
+        # Constant-quality VBR is NVENC's counterpart to x264's CRF
+        return ['-c:v', 'h264_nvenc', '-rc', 'vbr', '-cq', str(quality)]
+    if hwenc == 'qsv':
+        return ['-c:v', 'h264_qsv', '-global_quality', str(quality)]
+    return ['-c:v', 'libx264', '-crf', str(quality)]
+
+def default_jobs():
+    """Number of FFmpeg processes to run concurrently for per-scene work"""
+    return max(1, (os.cpu_count() or 1) // FFMPEG_THREADS_PER_JOB)
+
+def run_parallel(func, items, jobs=None):
+    """Call func on each item using a thread pool (work happens in FFmpeg subprocesses)"""
+    executor = ThreadPoolExecutor(max_workers=jobs or default_jobs())
+    try:
+        # list() re-raises the first exception from any worker
+        return list(executor.map(func, items))
+    finally:
+        # After a failure or Ctrl-C, items that have not started are dropped
+        # instead of each still launching its FFmpeg; running ones finish
+        executor.shutdown(cancel_futures=True)
+
 def get_video_info(file_path):
     """Get video duration and FPS"""
     log("Getting video information...")
     
-    # Get duration
-    cmd = ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
-           '-of', 'csv=p=0', str(file_path)]
+    # Duration and FPS in one probe
+    cmd = ['ffprobe', '-v', 'quiet', '-select_streams', 'v:0',
+           '-show_entries', 'format=duration:stream=r_frame_rate',
+           '-of', 'json', str(file_path)]
     result = subprocess.run(cmd, capture_output=True, text=True)
-    duration = float(result.stdout.strip()) if result.stdout.strip() else 0
+    try:
+        info = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        info = {}
     
-    # Get FPS
-    cmd = ['ffprobe', '-v', 'quiet', '-show_entries', 'stream=r_frame_rate', 
-           '-of', 'csv=p=0', str(file_path)]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    fps_str = result.stdout.strip().split('\n')[0] if result.stdout.strip() else "0/1"
+    duration = float(info.get('format', {}).get('duration', 0))
+    streams = info.get('streams') or [{}]
+    fps_str = streams[0].get('r_frame_rate', "0/1")
     
     # Convert fractional fps to decimal
     if '/' in fps_str:
@@ -146,317 +249,627 @@ def get_video_info(file_path):
     log(f"Video duration: {duration:.1f}s, FPS: {fps:.2f}")
     return duration, fps
 
-def analyze_brightness(file_path, output_dir, experimental_establishing=False, rich_analysis=False, audio_correlation=False):
-    """Analyze video brightness and optionally motion/scene characteristics"""
+def keyframe_times(file_path, times, lookback=KEYFRAME_LOOKBACK):
+    """Return the sorted presentation times of the video keyframes shortly before each of times"""
+    log("Reading keyframe positions...")
+    
+    # Packet flags come straight from the demuxer, so nothing is decoded, and
+    # -read_intervals limits the demuxing to a short window before each
+    # time instead of reading the whole file
+    intervals = ','.join(f"{max(0, t - lookback):.3f}%{t}" for t in times)
+    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+           '-read_intervals', intervals,
+           '-show_entries', 'packet=pts_time,flags',
+           '-of', 'csv=p=0', str(file_path)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags:
+            try:
+                keyframes.append(float(pts_time))
+            except ValueError:
+                continue
+    # Windows of nearby times overlap and report the same keyframes
+    return sorted(set(keyframes))
+
+def lavfi_escape(path):
+    """Escape a file path for use as a filter option inside a filtergraph"""
+    escaped = str(path)
+    # Option value level, then filtergraph level
+    for special in ("\\':", "\\'[],;"):
+        for ch in special:
+            escaped = escaped.replace(ch, '\\' + ch)
+    return escaped
+
+def scale_filter(width, gpu_decode=False):
+    """Filter chain downscaling frames to width, keeping the aspect ratio"""
+    if gpu_decode:
+        # With --gpu-decode the frames stay in GPU memory after NVDEC, so they
+        # are downscaled there and only the small copy is downloaded
+        return f'scale_cuda={width}:-2:format=yuv420p,hwdownload,format=yuv420p'
+    return f'scale={width}:-2:flags=area'
+
+def dark_frame_filter(luma_threshold):
+    """Filter that drops frames whose signalstats mean luma is not below luma_threshold"""
+    # Thresholding inside FFmpeg means bright frames never reach the parser
+    return f'metadata=select:key=lavfi.signalstats.YAVG:value={luma_threshold}:function=less'
+
+def ocr_filter(sample_interval, text_analysis_file=None, video_duration=None, gpu_decode=False):
+    """Filter chain running OCR every sample_interval seconds, writing the text to a file (or stdout)"""
+    # Text found in the middle of the video is never used as credits, so when
+    # the duration is known only the opening and closing windows reach the
+    # expensive ocr filter
+    credits_window = ''
+    if video_duration:
+        credits_window = (f"select='lt(t,{video_duration * OPENING_CREDITS_FRACTION})"
+                          f"+gt(t,{video_duration * CLOSING_CREDITS_FRACTION})',")
+    # Edge statistics are far cheaper than OCR, so featureless frames are
+    # dropped before they reach Tesseract
+    text_candidates = (f'siti,metadata=select:key=lavfi.siti.si:value={OCR_MIN_SPATIAL_INFO}'
+                       ':function=greater,')
+    # The ocr filter only attaches its result as frame metadata; metadata=print
+    # is what actually writes it out
+    output = lavfi_escape(text_analysis_file) if text_analysis_file else '-'
+    return (f'fps=1/{sample_interval},{credits_window}{scale_filter(OCR_WIDTH, gpu_decode)},'
+            f'{text_candidates}ocr,metadata=print:key=lavfi.ocr.text:file={output}')
+
+def video_branches(source, filters, output, text_filters=None, text_output=None, gpu_decode=False,
+                   width=ANALYSIS_WIDTH, analysis_fps=None):
+    """Filtergraph running filters on a downscaled copy of source, optionally fanning out to OCR"""
+    scale = scale_filter(width, gpu_decode)
+    if analysis_fps:
+        # Scene boundaries only need to be found to within a fraction of the
+        # minimum duration, so frames are sampled before any per-frame work
+        scale = f'fps={analysis_fps:g},{scale}'
+    if text_filters:
+        # Fan the decoded video out to a second branch so credits detection
+        # shares the analysis decode; its frames carry none of the analysis
+        # metadata and are skipped by the parsers
+        return (f'{source}split[luma][text];[luma]{scale},{filters}{output};'
+                f'[text]{text_filters}{text_output}')
+    return f'{source}{scale},{filters}{output}'
+
+def probe_luma_cmd(file_path, filters, width=ANALYSIS_WIDTH, analysis_fps=None):
+    """Build an ffprobe command printing one 'pts_time,YAVG' CSV row per frame"""
+    # ffprobe's structured writer replaces free-form showinfo text, so each
+    # frame is a single line that needs no regex to parse
+    graph = video_branches(f'movie={lavfi_escape(file_path)},', filters, '[out0]', width=width,
+                           analysis_fps=analysis_fps)
+    return [
+        'ffprobe', '-v', 'error',
+        '-f', 'lavfi', '-i', graph,
+        '-show_entries', 'frame=best_effort_timestamp_time:frame_tags=lavfi.signalstats.YAVG',
+        '-of', 'csv=p=0'
+    ]
+
+def decode_stats_cmd(file_path, filters, text_filters=None, hwaccel=None, gpu_decode=False, width=ANALYSIS_WIDTH,
+                     analysis_fps=None):
+    """Build an FFmpeg command whose filters print per-frame metadata records to stdout"""
+    # ffprobe's movie source cannot use a hardware decoder, so passes that
+    # need one decode with ffmpeg itself and discard the frames
+    graph = video_branches('[0:v]', filters, '[stats]', text_filters, '[ocr]', gpu_decode, width, analysis_fps)
+    # Without -nostats FFmpeg would print a progress line every half second
+    return [
+        'ffmpeg', '-nostats', '-loglevel', 'error', *decode_args(hwaccel, gpu_decode), '-i', str(file_path),
+        '-filter_complex', graph,
+        '-map', '[stats]', *(['-map', '[ocr]'] if text_filters else []),
+        '-f', 'null', '-'
+    ]
+
+def analyze_brightness(file_path, luma_threshold, experimental_establishing=False, rich_analysis=False, audio_correlation=False,
+                       text_analysis_file=None, credits_sample_interval=30, hwaccel=None, video_duration=None,
+                       gpu_decode=False, analysis_fps=None):
+    """Start FFmpeg brightness analysis and return the running process"""
     if audio_correlation:
         log("Analyzing video with audio-visual correlation...")
     elif rich_analysis:
         log("Analyzing video with comprehensive visual feature detection...")
     elif experimental_establishing:
         log("Analyzing video with experimental establishing shot detection...")
+    elif text_analysis_file:
+        log("Analyzing video brightness and text regions (credits)...")
     else:
         log("Analyzing video brightness...")
-    
-    analysis_file = output_dir / "brightness_analysis.txt"
+    if text_analysis_file and (audio_correlation or rich_analysis or experimental_establishing):
+        log("Detecting text regions (credits) in the same pass...")
+    
+    # An adaptive threshold is only known once every frame's luma has been
+    # seen, so in that case FFmpeg prints all frames
+    luma_select = '' if luma_threshold == 'adaptive' else ',' + dark_frame_filter(luma_threshold)
+    
+    # The audio pass reads both streams through ffprobe, which always
+    # decodes in software
+    gpu_decode = gpu_decode and not audio_correlation
+    
+    # The basic and rich passes read luma through ffprobe's CSV writer unless
+    # they share the decode with OCR or need a hardware decoder; then they
+    # run through ffmpeg, which prints luma as metadata records instead
+    decode_with_ffmpeg = bool(text_analysis_file) or bool(hwaccel) or gpu_decode
+    luma_print = ',metadata=print:key=lavfi.signalstats.YAVG:file=-' if decode_with_ffmpeg else ''
+    
+    # Every pass can run credits OCR on the same decode. ffprobe's lavfi input
+    # waits on every sink in turn, so an OCR branch that goes silent between
+    # the credits windows would stall it while the luma frames pile up
+    # unbounded; only the audio pass still needs ffprobe, and there OCR keeps
+    # sampling the whole video
+    text_filters = (ocr_filter(credits_sample_interval, text_analysis_file,
+                               None if audio_correlation else video_duration, gpu_decode)
+                    if text_analysis_file else None)
     
     if audio_correlation:
         # Audio-visual correlation analysis:
-        # - showinfo: frame info with luminance
-        # - astats: audio statistics per frame
-        # - volumedetect: volume level analysis
+        # - signalstats: mean luminance of each video frame
+        # - astats: RMS level of each audio frame, regrouped with asetnsamples
+        #   into one window per sampled video frame when sampling
+        # ffprobe prints one 'media_type,pts_time,value' row per frame of
+        # either stream, so both series carry their own timestamps
+        audio_window = (f'asetnsamples=n={round(NOMINAL_AUDIO_RATE / analysis_fps)}:p=0,'
+                        if analysis_fps else '')
+        graph = (f'movie={lavfi_escape(file_path)}:s=dv+da[v][a];'
+                 + video_branches('[v]', 'signalstats', '[out0]', text_filters, '[out2]',
+                                  analysis_fps=analysis_fps)
+                 + f';[a]{audio_window}astats=metadata=1:reset=1[out1]')
         cmd = [
-            'ffmpeg', '-i', str(file_path),
-            '-vf', 'showinfo',
-            '-af', 'astats=metadata=1:reset=1,aformat=sample_fmts=fltp',
-            '-f', 'null', '-'
+            'ffprobe', '-v', 'error',
+            '-f', 'lavfi', '-i', graph,
+            '-show_entries', 'frame=media_type,best_effort_timestamp_time'
+                             ':frame_tags=lavfi.signalstats.YAVG,lavfi.astats.Overall.RMS_level',
+            '-of', 'csv=p=0'
         ]
     elif rich_analysis:
         # Comprehensive visual analysis combining multiple attributes:
-        # - showinfo: frame info with luminance/color stats
         # - entropy: image complexity/randomness
-        # - signalstats: color distribution and saturation
+        # - signalstats: color distribution, saturation and mean luminance
         # - sobel: edge detection for composition analysis
         # - freezedetect: detect static frames
-        cmd = [
-            'ffmpeg', '-i', str(file_path),
-            '-vf', 'showinfo,entropy,signalstats=stat=tout+vrep+brng,sobel,freezedetect=n=-60dB:d=0.5',
-            '-f', 'null', '-'
-        ]
+        filters = 'entropy,signalstats=stat=tout+vrep+brng,sobel,freezedetect=n=-60dB:d=0.5' + luma_select
+        cmd = (decode_stats_cmd(file_path, filters + luma_print, text_filters, hwaccel, gpu_decode,
+                                EDGE_ANALYSIS_WIDTH, analysis_fps) if decode_with_ffmpeg
+               else probe_luma_cmd(file_path, filters, EDGE_ANALYSIS_WIDTH, analysis_fps))
     elif experimental_establishing:
         # Enhanced filter chain for establishing shot detection:
-        # - showinfo: basic frame info with luminance
-        # - sobel: edge detection (more edges = more detail/wide shots)
-        # - select with scene change detection
-        cmd = [
-            'ffmpeg', '-i', str(file_path),
-            '-vf', 'showinfo,sobel,metadata=print:file=-',
-            '-f', 'null', '-'
-        ]
+        # - signalstats: mean luminance (lavfi.signalstats.YAVG)
+        # - siti: spatial information, the spread of Sobel edge magnitudes
+        #   (lavfi.siti.si, more edges = more detail/wide shots)
+        # - metadata=print: one structured record per frame on stdout
+        cmd = decode_stats_cmd(file_path, 'signalstats,siti,metadata=print:file=-', text_filters, hwaccel, gpu_decode,
+                               EDGE_ANALYSIS_WIDTH, analysis_fps)
     else:
-        # Standard brightness analysis
-        cmd = [
-            'ffmpeg', '-i', str(file_path),
-            '-vf', 'showinfo',
-            '-f', 'null', '-'
-        ]
-    
-    with open(analysis_file, 'w') as f:
-        process = subprocess.run(cmd, stderr=f, text=True)
-    
-    if process.returncode != 0:
+        # Standard brightness analysis, only dark frames are printed
+        filters = 'signalstats' + luma_select
+        cmd = (decode_stats_cmd(file_path, filters + luma_print, text_filters, hwaccel, gpu_decode,
+                                analysis_fps=analysis_fps) if decode_with_ffmpeg
+               else probe_luma_cmd(file_path, filters, analysis_fps=analysis_fps))
+    
+    # Stream the analysis output straight into the parser instead of a temporary file;
+    # the caller reads process.stdout and then calls finish_analysis().
+    # stderr is left on the terminal: merged into stdout, FFmpeg's messages
+    # would land in the middle of buffered metadata records, and an unread
+    # pipe could fill and stall the analysis. Only errors are printed there.
+    # Output is left as bytes: the parsers only need ASCII, so decoding every
+    # line would be wasted work.
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=1024 * 1024)
+    return process
+
+def tee_lines(lines, output_file):
+    """Yield lines unchanged while also writing them to output_file"""
+    with open(output_file, 'wb') as f:
+        for line in lines:
+            f.write(line)
+            yield line
+    log(f"Raw analysis output saved to {output_file}")
+
+def finish_analysis(process):
+    """Wait for the analysis process and check that it succeeded"""
+    if process.wait() != 0:
         raise RuntimeError("FFmpeg analysis failed")
-    
-    log(f"Analysis complete, output saved to {analysis_file}")
-    return analysis_file
+    log("Analysis complete")
+
+def stop_process(process):
+    """Kill process if it is still running, e.g. because its output is no longer being read"""
+    if process.poll() is None:
+        process.kill()
+        process.wait()
 
-def detect_text_regions(file_path, output_dir, sample_interval=30):
+def analysis_mode(experimental_establishing, rich_analysis, audio_correlation):
+    """Name of the analysis pass analyze_brightness() runs for these options"""
+    if audio_correlation:
+        return 'audio'
+    if rich_analysis:
+        return 'rich'
+    if experimental_establishing:
+        return 'establishing'
+    return 'basic'
+
+def input_cache_key(file_path, *options):
+    """Short hash identifying file_path by its size and mtime, plus the given options"""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    key = ':'.join(map(str, (path, stat.st_size, stat.st_mtime_ns, *options)))
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+def analysis_cache_file(output_dir, file_path, mode, analysis_fps=None):
+    """Path of the cached analysis output for file_path, keyed on its size and mtime"""
+    return output_dir / f"analysis_{input_cache_key(file_path, mode, analysis_fps or 'all')}.txt"
+
+def load_analysis_cache(cache_file, luma_threshold):
+    """Return the cached analysis lines if they cover luma_threshold, else None"""
+    try:
+        with open(cache_file, 'rb') as f:
+            # Only frames darker than the analysis threshold were recorded, so
+            # the cache also holds every frame for any lower threshold
+            cached_threshold = float(f.readline().partition(b'=')[2])
+            if luma_threshold > cached_threshold:
+                return None
+            return f.readlines()
+    except (OSError, ValueError):
+        return None
+
+def cache_lines(lines, cache_file, luma_threshold):
+    """Yield lines unchanged while also writing them to a temporary cache file"""
+    # The caller moves the file into place once the analysis has succeeded,
+    # so a failed run never leaves a truncated cache behind
+    with open(cache_file.with_suffix('.tmp'), 'wb') as f:
+        f.write(f"luma_threshold={luma_threshold}\n".encode())
+        for line in lines:
+            f.write(line)
+            yield line
+
+def detect_text_regions(file_path, sample_interval=30, hwaccel=None, video_duration=None, gpu_decode=False):
     """Detect text-heavy regions in video (likely credits) using OCR"""
     log("Detecting text regions (credits) in video...")
     
-    text_analysis_file = output_dir / "text_analysis.txt"
-    
-    # Sample frames at intervals and run OCR
+    # Sample frames at intervals and run OCR, reading the recognised text
+    # from the pipe while FFmpeg is still decoding
     cmd = [
-        'ffmpeg', '-i', str(file_path),
-        '-vf', f'fps=1/{sample_interval},ocr',
+        'ffmpeg', '-loglevel', 'error', *decode_args(hwaccel, gpu_decode), '-i', str(file_path), '-an',
+        '-vf', ocr_filter(sample_interval, video_duration=video_duration, gpu_decode=gpu_decode),
         '-f', 'null', '-'
     ]
     
-    try:
-        with open(text_analysis_file, 'w') as f:
-            process = subprocess.run(cmd, stderr=f, text=True)
-        
-        if process.returncode != 0:
-            log("Warning: Text detection failed, credits filtering disabled")
-            return []
-        
-    except Exception as e:
-        log(f"Warning: Text detection error ({e}), credits filtering disabled")
-        return []
+    with ExitStack() as cleanup:
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                       encoding='utf-8', errors='replace')
+            # If parsing fails or is interrupted, FFmpeg is killed rather
+            # than left decoding the rest of the video
+            cleanup.callback(stop_process, process)
+            with process.stdout:
+                text_regions = text_regions_from_ocr(process.stdout, sample_interval, video_duration)
+            
+            if process.wait() != 0:
+                log("Warning: Text detection failed, credits filtering disabled")
+                return None
+            
+        except Exception as e:
+            log(f"Warning: Text detection error ({e}), credits filtering disabled")
+            return None
     
-    # Parse OCR results to find text-heavy regions
-    text_regions = parse_text_analysis(text_analysis_file, sample_interval)
     log(f"Found {len(text_regions)} potential credit regions")
+    return text_regions
+
+def load_text_regions(text_analysis_file, sample_interval, video_duration=None):
+    """Parse OCR results to find text-heavy regions"""
+    text_regions = parse_text_analysis(text_analysis_file, sample_interval, video_duration)
+    if text_regions is not None:
+        log(f"Found {len(text_regions)} potential credit regions")
     
     return text_regions
 
-def parse_text_analysis(analysis_file, sample_interval):
+def credits_cache_file(output_dir, file_path, sample_interval):
+    """Path of the cached credit regions for file_path at this OCR sampling interval"""
+    return output_dir / f"credits_{input_cache_key(file_path, 'credits', sample_interval)}.json"
+
+def load_credits_cache(cache_file):
+    """Return the cached credit regions, or None if there is no usable cache"""
+    try:
+        with open(cache_file) as f:
+            return [(start, end) for start, end in json.load(f)['text_regions']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_credits_cache(cache_file, text_regions):
+    """Write credit regions to cache_file for later runs on the same input"""
+    # Written to a temporary file first so an interrupted run never leaves a
+    # truncated cache behind
+    tmp_file = cache_file.with_suffix('.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump({'text_regions': text_regions}, f)
+    os.replace(tmp_file, cache_file)
+
+def parse_text_analysis(analysis_file, sample_interval, video_duration=None):
     """Parse OCR output to identify text-heavy regions"""
-    text_regions = []
-    
     try:
         with open(analysis_file, 'r') as f:
-            content = f.read()
-        
-        # Look for OCR output patterns in FFmpeg stderr
-        # OCR filter outputs detected text with timestamps
-        ocr_pattern = r'pts_time:([0-9]*\.?[0-9]+).*lavfi\.ocr\.text=([^\]]+)'
-        
-        text_timestamps = {}
-        for match in re.finditer(ocr_pattern, content):
-            timestamp = float(match.group(1))
-            text = match.group(2).strip()
+            return text_regions_from_ocr(f, sample_interval, video_duration)
+    except Exception as e:
+        log(f"Warning: Error parsing text analysis: {e}")
+        return None
+
+def text_regions_from_ocr(lines, sample_interval, video_duration=None):
+    """Group OCR metadata=print records into text-heavy (start, end) regions"""
+    text_regions = []
+    
+    # Group consecutive high-text frames; OCR samples arrive in presentation
+    # order, so each one is handled as soon as its record is complete
+    current_start = None
+    last_timestamp = None
+    last_sample = None
+    text_density_threshold = 50  # characters
+    
+    # metadata=print writes a 'frame:N pts:P pts_time:T' header followed by
+    # 'lavfi.ocr.text=...'; recognised text can span several lines.
+    # A trailing sentinel header flushes the last record.
+    timestamp = None
+    text_lines = None
+    for line in chain(lines, ('frame:',)):
+        if line.startswith('frame:'):
+            if text_lines is not None:
+                text = ''.join(text_lines).strip()
+                
+                # Count significant text (ignore short/noise text)
+                if len(text) > 10 and any(c.isalpha() for c in text):
+                    if len(text) >= text_density_threshold:
+                        if current_start is None:
+                            current_start = timestamp
+                    elif current_start is not None:
+                        # End of text region
+                        text_regions.append((current_start, timestamp))
+                        current_start = None
+                    last_timestamp = timestamp
             
-            # Count significant text (ignore short/noise text)
-            if len(text) > 10 and any(c.isalpha() for c in text):
-                text_timestamps[timestamp] = len(text)
-        
-        if not text_timestamps:
-            return text_regions
-        
-        # Find regions with high text density
-        sorted_times = sorted(text_timestamps.keys())
-        
-        # Group consecutive high-text frames
-        current_start = None
-        text_density_threshold = 50  # characters
-        
-        for timestamp in sorted_times:
-            text_length = text_timestamps[timestamp]
+            _, found, pts_time = line.rpartition('pts_time:')
+            try:
+                timestamp = float(pts_time) if found else None
+            except ValueError:
+                timestamp = None
+            text_lines = None
             
-            if text_length >= text_density_threshold:
-                if current_start is None:
-                    current_start = timestamp
-            else:
-                if current_start is not None:
-                    # End of text region
-                    text_regions.append((current_start, timestamp))
+            if timestamp is not None:
+                # Samples between the credits windows are never OCRed, so a
+                # region still open when sampling jumps across them ends
+                # there. Featureless samples dropped before OCR leave gaps
+                # too, but like other text-free samples they end nothing.
+                if (current_start is not None and video_duration
+                        and last_sample < video_duration * OPENING_CREDITS_FRACTION
+                        and timestamp > video_duration * CLOSING_CREDITS_FRACTION):
+                    text_regions.append((current_start, last_sample + sample_interval))
                     current_start = None
-        
-        # Don't forget the last region
-        if current_start is not None:
-            text_regions.append((current_start, sorted_times[-1] + sample_interval))
-        
-    except Exception as e:
-        log(f"Warning: Error parsing text analysis: {e}")
+                last_sample = timestamp
+        elif text_lines is not None:
+            text_lines.append(line)
+        elif timestamp is not None and line.startswith('lavfi.ocr.text='):
+            text_lines = [line[len('lavfi.ocr.text='):]]
+    
+    # Don't forget the last region
+    if current_start is not None:
+        text_regions.append((current_start, last_timestamp + sample_interval))
     
     return text_regions
 
-def extract_night_timestamps(analysis_file, luma_threshold, experimental_establishing=False, audio_correlation=False, quiet_threshold=-40.0, loud_threshold=-10.0, audio_mode='both'):
-    """Parse FFmpeg output to find dark frames, optionally filtering for establishing shots or audio correlation"""
+def extract_night_timestamps(analysis_lines, luma_threshold, experimental_establishing=False, audio_correlation=False, quiet_threshold=-40.0, loud_threshold=-10.0, audio_mode='both',
+                             luma_percentile=15):
+    """Parse FFmpeg log lines into dark frame timestamps and the luma threshold they were selected with"""
     if audio_correlation:
         log("Extracting audio-correlated night scene timestamps...")
-        return extract_audio_correlated_timestamps(analysis_file, luma_threshold, quiet_threshold, loud_threshold, audio_mode)
+        return extract_audio_correlated_timestamps(analysis_lines, luma_threshold, quiet_threshold, loud_threshold, audio_mode,
+                                                   luma_percentile)
     elif experimental_establishing:
         log("Extracting night establishing shot timestamps...")
-        return extract_establishing_shot_timestamps(analysis_file, luma_threshold)
+        return extract_establishing_shot_timestamps(analysis_lines, luma_threshold, luma_percentile)
     else:
         log("Extracting night scene timestamps...")
-        return extract_basic_night_timestamps(analysis_file, luma_threshold)
+        return extract_basic_night_timestamps(analysis_lines, luma_threshold, luma_percentile)
+
+def luma_records(analysis_lines):
+    """Yield (timestamp, luma) tuples from probe_luma_cmd() CSV rows or metadata=print records"""
+    timestamp = None
+    for line in analysis_lines:
+        # metadata=print (used with --gpu-decode) writes a 'frame:N pts:P pts_time:T'
+        # header before the frame's YAVG line
+        if line.startswith(b'frame:'):
+            _, found, pts_time = line.rpartition(b'pts_time:')
+            try:
+                timestamp = float(pts_time) if found else None
+            except ValueError:
+                timestamp = None
+            continue
+        if line.startswith(b'lavfi.signalstats.YAVG='):
+            try:
+                mean_luma = float(line.split(b'=', 1)[1])
+            except ValueError:
+                continue
+            if timestamp is not None:
+                yield timestamp, mean_luma
+            continue
+        fields = line.split(b',')
+        if len(fields) != 2:
+            continue
+        try:
+            yield float(fields[0]), float(fields[1])
+        except ValueError:
+            continue
+
+def resolve_luma_threshold(luma_threshold, lumas, luma_percentile):
+    """Return luma_threshold, or for 'adaptive' the luma_percentile-th percentile of the frame lumas"""
+    if luma_threshold != 'adaptive':
+        return luma_threshold
+    ordered = sorted(lumas)
+    percentile_luma = ordered[min(len(ordered) - 1, int(len(ordered) * luma_percentile / 100))]
+    # Dark frames are those strictly below the threshold; nudging it just past
+    # the percentile keeps runs of identical (e.g. black) frames at that value
+    threshold = math.nextafter(percentile_luma, math.inf)
+    log(f"Adaptive luma threshold: {threshold:g} ({luma_percentile:g}th percentile of frame luma)")
+    return threshold
 
-def extract_basic_night_timestamps(analysis_file, luma_threshold):
+def extract_basic_night_timestamps(analysis_lines, luma_threshold, luma_percentile=15):
     """Basic night scene detection by brightness only"""
-    timestamps = []
-    
-    # Regex patterns
-    showinfo_pattern = r'Parsed_showinfo.*pts_time:([0-9]*\.?[0-9]+).*mean:\[([0-9]+)'
-    
-    with open(analysis_file, 'r') as f:
-        for line in f:
-            match = re.search(showinfo_pattern, line)
-            if match:
-                timestamp = float(match.group(1))
-                mean_luma = int(match.group(2))
-                
-                if mean_luma < luma_threshold:
-                    timestamps.append(timestamp)
+    if luma_threshold == 'adaptive':
+        # Every frame is kept as two packed columns instead of a tuple per frame
+        frame_times = array('d')
+        frame_lumas = array('d')
+        for timestamp, mean_luma in luma_records(analysis_lines):
+            frame_times.append(timestamp)
+            frame_lumas.append(mean_luma)
+        if not frame_times:
+            log("No frame data found in brightness analysis")
+            return array('d'), luma_threshold
+        luma_threshold = resolve_luma_threshold(luma_threshold, frame_lumas, luma_percentile)
+        timestamps = array('d', compress(frame_times, (mean_luma < luma_threshold for mean_luma in frame_lumas)))
+    else:
+        # Records are parsed as they arrive on the pipe, while FFmpeg keeps decoding
+        timestamps = array('d', (timestamp for timestamp, mean_luma in luma_records(analysis_lines)
+                                 if mean_luma < luma_threshold))
     
-    log(f"Found {len(timestamps)} dark frames (luma < {luma_threshold})")
-    return timestamps
+    log(f"Found {len(timestamps)} dark frames (luma < {luma_threshold:g})")
+    return timestamps, luma_threshold
 
-def extract_establishing_shot_timestamps(analysis_file, luma_threshold):
+def extract_establishing_shot_timestamps(analysis_lines, luma_threshold, luma_percentile=15):
     """Experimental: Detect night establishing shots using brightness + visual complexity"""
-    timestamps = []
-    frame_data = []
-    
-    # Parse both showinfo and metadata for enhanced analysis
-    showinfo_pattern = r'Parsed_showinfo.*pts_time:([0-9]*\.?[0-9]+).*mean:\[([0-9]+)'
-    
-    with open(analysis_file, 'r') as f:
-        lines = f.readlines()
-    
-    # Extract frame data
-    for i, line in enumerate(lines):
-        showinfo_match = re.search(showinfo_pattern, line)
-        if showinfo_match:
-            timestamp = float(showinfo_match.group(1))
-            mean_luma = int(showinfo_match.group(2))
+    timestamps = array('d')
+    
+    # Per-frame values are kept as parallel typed arrays rather than a dict per
+    # frame, which is roughly a tenth of the memory on long videos
+    frame_times = array('d')
+    frame_lumas = array('d')
+    frame_edges = array('d')
+    
+    # metadata=print writes a 'frame:N pts:P pts_time:T' header followed by one
+    # key=value line per metadata entry, so each frame is parsed as a record
+    timestamp = None
+    mean_luma = None
+    edge_complexity = 0
+    # Positive edge values are summed while parsing, so the threshold below
+    # needs no extra pass over frame_edges
+    edge_total = 0.0
+    edge_count = 0
+    
+    # A trailing sentinel header flushes the last record
+    for line in chain(analysis_lines, (b'frame:',)):
+        if line.startswith(b'frame:'):
+            if timestamp is not None and mean_luma is not None:
+                frame_times.append(timestamp)
+                frame_lumas.append(mean_luma)
+                frame_edges.append(edge_complexity)
+                if edge_complexity > 0:
+                    edge_total += edge_complexity
+                    edge_count += 1
             
-            # Look for edge detection metadata in surrounding lines
+            _, found, pts_time = line.rpartition(b'pts_time:')
+            try:
+                timestamp = float(pts_time) if found else None
+            except ValueError:
+                timestamp = None
+            mean_luma = None
             edge_complexity = 0
-            for j in range(max(0, i-2), min(len(lines), i+3)):
-                if 'sobel' in lines[j].lower() or 'edge' in lines[j].lower():
-                    # Extract edge detection metrics if available
-                    edge_match = re.search(r'edge.*:([0-9.]+)', lines[j])
-                    if edge_match:
-                        edge_complexity = float(edge_match.group(1))
-                        break
-            
-            frame_data.append({
-                'timestamp': timestamp,
-                'luma': mean_luma,
-                'edges': edge_complexity
-            })
-    
-    if not frame_data:
+        elif timestamp is not None:
+            # A malformed value leaves the frame without luma (dropped) or
+            # without edges, rather than aborting the analysis
+            try:
+                if line.startswith(b'lavfi.signalstats.YAVG='):
+                    mean_luma = float(line.split(b'=', 1)[1])
+                elif line.startswith(b'lavfi.siti.si='):
+                    edge_complexity = float(line.split(b'=', 1)[1])
+            except ValueError:
+                continue
+    
+    if not frame_times:
         log("No frame data found for establishing shot analysis")
-        return timestamps
+        return timestamps, luma_threshold
     
     # Calculate thresholds based on data distribution
-    edge_values = [f['edges'] for f in frame_data if f['edges'] > 0]
-    if edge_values:
+    if edge_count:
         # Higher edge count suggests more detail (wider shots vs close-ups)
-        edge_threshold = sum(edge_values) / len(edge_values) * 1.2  # 20% above average
+        edge_threshold = edge_total / edge_count * 1.2  # 20% above average
         log(f"Using edge complexity threshold: {edge_threshold:.2f}")
     else:
         edge_threshold = 0
         log("No edge data available, falling back to brightness-only detection")
     
-    # Filter for night establishing shots
-    for frame in frame_data:
-        is_dark = frame['luma'] < luma_threshold
-        is_complex = frame['edges'] >= edge_threshold if edge_threshold > 0 else True
-        
-        if is_dark and is_complex:
-            timestamps.append(frame['timestamp'])
+    luma_threshold = resolve_luma_threshold(luma_threshold, frame_lumas, luma_percentile)
+    
+    # Filter for night establishing shots with one byte mask per condition,
+    # which also gives the counts for the summary below
+    is_dark = bytes(mean_luma < luma_threshold for mean_luma in frame_lumas)
+    is_complex = (bytes(edges >= edge_threshold for edges in frame_edges) if edge_threshold > 0
+                  else b'\x01' * len(frame_edges))
+    timestamps = array('d', compress(frame_times, map(and_, is_dark, is_complex)))
     
     log(f"Found {len(timestamps)} potential night establishing shots")
-    log(f"  - Dark frames (luma < {luma_threshold}): {sum(1 for f in frame_data if f['luma'] < luma_threshold)}")
-    log(f"  - Complex frames (edges >= {edge_threshold:.2f}): {sum(1 for f in frame_data if f['edges'] >= edge_threshold)}")
+    log(f"  - Dark frames (luma < {luma_threshold:g}): {is_dark.count(1)}")
+    log(f"  - Complex frames (edges >= {edge_threshold:.2f}): {is_complex.count(1)}")
     
-    return timestamps
+    return timestamps, luma_threshold
 
-def extract_audio_correlated_timestamps(analysis_file, luma_threshold, quiet_threshold, loud_threshold, audio_mode):
+def extract_audio_correlated_timestamps(analysis_lines, luma_threshold, quiet_threshold, loud_threshold, audio_mode,
+                                        luma_percentile=15):
     """Extract dark scenes correlated with specific audio volume levels"""
-    timestamps = []
-    
-    # Regex patterns for parsing both video and audio metadata
-    showinfo_pattern = r'Parsed_showinfo.*pts_time:([0-9]*\.?[0-9]+).*mean:\[([0-9]+)'
-    # Audio RMS level pattern from astats filter
-    audio_rms_pattern = r'lavfi\.astats\.Overall\.RMS_level=([+-]?[0-9]*\.?[0-9]+)'
-    
-    with open(analysis_file, 'r') as f:
-        lines = f.readlines()
-    
-    # Parse frame data with audio correlation
-    frame_data = []
-    current_timestamp = None
-    current_luma = None
-    
-    for i, line in enumerate(lines):
-        # Check for video frame info
-        showinfo_match = re.search(showinfo_pattern, line)
-        if showinfo_match:
-            current_timestamp = float(showinfo_match.group(1))
-            current_luma = int(showinfo_match.group(2))
-        
-        # Check for audio RMS level in surrounding lines
-        if current_timestamp is not None and current_luma is not None:
-            audio_rms = None
-            # Look for audio stats in nearby lines (FFmpeg interleaves output)
-            for j in range(max(0, i-5), min(len(lines), i+6)):
-                audio_match = re.search(audio_rms_pattern, lines[j])
-                if audio_match:
-                    audio_rms = float(audio_match.group(1))
-                    break
-            
-            if audio_rms is not None:
-                frame_data.append({
-                    'timestamp': current_timestamp,
-                    'luma': current_luma,
-                    'audio_rms': audio_rms
-                })
-                current_timestamp = None
-                current_luma = None
-    
-    if not frame_data:
+    timestamps = array('d')
+    
+    # Video and audio frames arrive as separate time series, kept as
+    # parallel typed arrays
+    video_times = array('d')
+    video_lumas = array('d')
+    audio_times = array('d')
+    audio_levels = array('d')
+    
+    for line in analysis_lines:
+        fields = line.split(b',')
+        if len(fields) != 3:
+            continue
+        try:
+            timestamp = float(fields[1])
+            value = float(fields[2])
+        except ValueError:
+            continue
+        if fields[0] == b'video':
+            video_times.append(timestamp)
+            video_lumas.append(value)
+        elif fields[0] == b'audio':
+            audio_times.append(timestamp)
+            audio_levels.append(value)
+    
+    if not video_times or not audio_times:
         log("No audio-visual correlation data found")
-        return timestamps
+        return timestamps, luma_threshold
+    
+    # Determine once per audio frame whether its level matches the criteria
+    match_quiet = audio_mode in ('quiet', 'both')
+    match_loud = audio_mode in ('loud', 'both')
+    audio_matches = bytes((match_quiet and audio_rms < quiet_threshold) or (match_loud and audio_rms > loud_threshold)
+                          for audio_rms in audio_levels)
+    
+    # Join each video frame to the audio frame nearest in time; both series
+    # are in presentation order, so a binary search finds the neighbours
+    last_audio = len(audio_times) - 1
+    frame_matches = bytearray()
+    for timestamp in video_times:
+        k = min(bisect_left(audio_times, timestamp), last_audio)
+        if k and timestamp - audio_times[k - 1] < audio_times[k] - timestamp:
+            k -= 1
+        frame_matches.append(audio_matches[k])
+    
+    luma_threshold = resolve_luma_threshold(luma_threshold, video_lumas, luma_percentile)
     
     # Filter based on brightness and audio criteria
-    for frame in frame_data:
-        is_dark = frame['luma'] < luma_threshold
-        audio_rms = frame['audio_rms']
-        
-        # Determine if audio level matches criteria
-        is_quiet = audio_rms < quiet_threshold
-        is_loud = audio_rms > loud_threshold
-        
-        audio_matches = False
-        if audio_mode == 'quiet' and is_quiet:
-            audio_matches = True
-        elif audio_mode == 'loud' and is_loud:
-            audio_matches = True
-        elif audio_mode == 'both' and (is_quiet or is_loud):
-            audio_matches = True
-        
-        if is_dark and audio_matches:
-            timestamps.append(frame['timestamp'])
+    is_dark = bytes(mean_luma < luma_threshold for mean_luma in video_lumas)
+    timestamps = array('d', compress(video_times, map(and_, is_dark, frame_matches)))
     
     log(f"Found {len(timestamps)} dark scenes with {audio_mode} audio")
     log(f"  - Audio thresholds: quiet < {quiet_threshold}dB, loud > {loud_threshold}dB")
     
-    return timestamps
+    return timestamps, luma_threshold
+
+def scenes_reach_credits(scenes, video_duration, sample_interval):
+    """Check whether any scene could overlap a credits region found by OCR"""
+    # OCR only samples the opening and closing windows, so opening regions
+    # end at most one sample after the opening window and closing regions
+    # start inside the closing window
+    opening_end = video_duration * OPENING_CREDITS_FRACTION + sample_interval
+    closing_start = video_duration * CLOSING_CREDITS_FRACTION
+    return any(start < opening_end or end > closing_start for start, end in scenes)
 
 def filter_credits_from_scenes(scenes, text_regions, video_duration):
     """Remove scenes that overlap with detected credit regions"""
@@ -471,10 +884,10 @@ def filter_credits_from_scenes(scenes, text_regions, video_duration):
     
     for start, end in text_regions:
         # Opening credits: within first 10% of video
-        if start < video_duration * 0.1:
+        if start < video_duration * OPENING_CREDITS_FRACTION:
             opening_credits.append((start, end))
         # Closing credits: within last 15% of video
-        elif start > video_duration * 0.85:
+        elif start > video_duration * CLOSING_CREDITS_FRACTION:
             closing_credits.append((start, end))
     
     # Merge overlapping credit regions
@@ -500,127 +913,268 @@ def filter_credits_from_scenes(scenes, text_regions, video_duration):
     if closing_credits:
         log(f"Found closing credits: {len(closing_credits)} regions")
     
+    # Both lists are sorted by start and every opening region starts before
+    # every closing one, so the concatenation is sorted too. A scene overlaps
+    # the credits iff some region starting before the scene ends also ends
+    # after it starts, i.e. the furthest end among those regions does.
+    credit_starts = [start for start, end in all_credits]
+    furthest_ends = list(accumulate((end for start, end in all_credits), max))
+    
     # Filter scenes that don't overlap with credits
     filtered_scenes = []
     filtered_count = 0
     
     for scene_start, scene_end in scenes:
-        overlaps_with_credits = False
-        
-        for credit_start, credit_end in all_credits:
-            # Check for overlap: scenes overlap if they don't end before the other starts
-            if not (scene_end <= credit_start or scene_start >= credit_end):
-                overlaps_with_credits = True
-                break
-        
-        if not overlaps_with_credits:
-            filtered_scenes.append((scene_start, scene_end))
-        else:
+        k = bisect_left(credit_starts, scene_end)
+        if k and furthest_ends[k - 1] > scene_start:
             filtered_count += 1
+        else:
+            filtered_scenes.append((scene_start, scene_end))
     
     log(f"Filtered out {filtered_count} scenes overlapping with credits")
     log(f"Remaining scenes: {len(filtered_scenes)}")
     
     return filtered_scenes
 
-def create_scene_segments(timestamps, min_duration):
+def scene_segments(timestamps, min_duration, analysis_fps=None):
+    """Yield (start, end) scenes from dark-frame timestamps that arrive in presentation order"""
+    max_gap = min_duration * 2
+    if analysis_fps:
+        # Sampled frames are 1/analysis_fps apart, so a very short minimum
+        # duration must not split a continuous dark run at every sample
+        max_gap = max(max_gap, 1.5 / analysis_fps)
+    current_start = current_end = None
+    
+    for timestamp in timestamps:
+        # A gap larger than max_gap between consecutive dark frames ends a scene
+        if current_end is not None and timestamp - current_end <= max_gap:
+            current_end = timestamp
+            continue
+        # Keep scenes that meet minimum duration
+        if current_end is not None and current_end - current_start >= min_duration:
+            yield current_start, current_end
+        current_start = current_end = timestamp
+    
+    if current_end is not None and current_end - current_start >= min_duration:
+        yield current_start, current_end
+
+def create_scene_segments(timestamps, min_duration, analysis_fps=None):
     """Group timestamps into continuous scenes"""
     log("Creating scene segments...")
     
-    if not timestamps:
-        return []
-    
-    timestamps.sort()
-    scenes = []
-    current_start = timestamps[0]
-    current_end = timestamps[0]
-    
-    for i in range(1, len(timestamps)):
-        # If gap is small, extend current scene
-        if timestamps[i] - current_end <= min_duration * 2:
-            current_end = timestamps[i]
-        else:
-            # Save current scene if it meets minimum duration
-            if current_end - current_start >= min_duration:
-                scenes.append((current_start, current_end))
-            current_start = timestamps[i]
-            current_end = timestamps[i]
-    
-    # Don't forget the last scene
-    if current_end - current_start >= min_duration:
-        scenes.append((current_start, current_end))
+    # Every analysis pass reports frames in presentation order, so the
+    # timestamps are grouped as they come without sorting them first
+    scenes = list(scene_segments(timestamps, min_duration, analysis_fps))
     
     log(f"Created {len(scenes)} night scenes")
     return scenes
 
-def extract_video_segments(scenes, input_file, output_dir, quality, format_ext, extract_frames, frame_interval):
+def extract_video_segments(scenes, input_file, output_dir, quality, format_ext, extract_frames, frame_interval,
+                           single_pass=False, stream_copy=False, tile=None, jobs=None, hwaccel=None, hwenc=None,
+                           frame_format='jpg'):
     """Extract video segments for each scene"""
     if not scenes:
         log("No scenes to extract")
         return
     
-    log("Extracting night scene videos...")
     filename = Path(input_file).stem
     
-    for i, (start_time, end_time) in enumerate(scenes, 1):
-        duration = end_time - start_time
-        output_file = output_dir / f"night_scene_{i:03d}_{filename}.{format_ext}"
-        
-        log(f"Extracting scene {i}: {start_time:.3f}s - {end_time:.3f}s ({duration:.3f}s)")
-        
-        cmd = [
-            'ffmpeg', '-y', '-loglevel', 'warning',
-            '-ss', str(start_time),
-            '-i', str(input_file),
-            '-t', str(duration),
-            '-c:v', 'libx264',
-            '-crf', str(quality),
+    # Everything except the seek, duration and output name is the same for
+    # every scene, so build it once
+    src = str(input_file)
+    output_prefix = str(output_dir / "night_scene_")
+    output_suffix = f"_{filename}.{format_ext}"
+    cmd_head = ['ffmpeg', '-y', '-loglevel', 'warning', *hwaccel_args(hwaccel)]
+    if stream_copy:
+        # Remux without decoding; cuts snap to the nearest keyframe
+        cmd_tail = ['-c', 'copy', '-avoid_negative_ts', 'make_zero']
+    else:
+        cmd_tail = [
+            *video_encoder_args(quality, hwenc),
             '-c:a', 'aac',
+            '-threads', str(FFMPEG_THREADS_PER_JOB),
             '-avoid_negative_ts', 'make_zero',
-            str(output_file)
         ]
+    
+    if single_pass and stream_copy:
+        log("Warning: --single-pass needs decoding, ignoring it in favour of --copy")
+    elif single_pass and len(scenes) > MAX_SINGLE_PASS_SCENES:
+        log(f"Too many scenes for a single pass ({len(scenes)} > {MAX_SINGLE_PASS_SCENES}), extracting per scene")
+    elif single_pass and len(scenes) > 1:
+        log(f"Extracting {len(scenes)} night scene videos in a single pass...")
+        
+        # One input feeding an output per scene: the file is demuxed and decoded
+        # once and each output's -ss/-t picks its scene out of that stream
+        cmd = [*cmd_head, '-i', src]
+        for i, (start_time, end_time) in enumerate(scenes, 1):
+            cmd += [
+                '-ss', str(start_time),
+                '-t', str(end_time - start_time),
+                *cmd_tail,
+                f"{output_prefix}{i:03d}{output_suffix}"
+            ]
         
         subprocess.run(cmd, check=True)
         
         if extract_frames:
-            extract_scene_frames(start_time, end_time, i, filename, 
-                               input_file, output_dir, frame_interval)
+            extract_frames_only(scenes, input_file, output_dir, frame_interval, single_pass=True, tile=tile,
+                                hwaccel=hwaccel, frame_format=frame_format)
+        return
+    
+    log("Extracting night scene videos...")
+    
+    if extract_frames:
+        create_frame_dirs(output_dir, len(scenes), tile)
+    
+    # A stream copy can only start on a keyframe; starting the cut exactly on
+    # the one before each scene keeps the segment's real length and start
+    # time instead of leaving FFmpeg to pad or hide the lead-in
+    keyframes = keyframe_times(input_file, [start_time for start_time, _ in scenes]) if stream_copy else []
+    
+    def extract_one(scene):
+        i, (start_time, end_time) = scene
+        k = bisect_right(keyframes, start_time)
+        cut_start = keyframes[k - 1] if k else start_time
+        duration = end_time - cut_start
+        
+        log(f"Extracting scene {i}: {start_time:.3f}s - {end_time:.3f}s ({end_time - start_time:.3f}s)")
+        if cut_start != start_time:
+            log(f"  - Cut starts at keyframe {cut_start:.3f}s")
+        
+        cmd = [
+            *cmd_head,
+            '-ss', str(cut_start),
+            '-i', src,
+            '-t', str(duration),
+            *cmd_tail,
+            f"{output_prefix}{i:03d}{output_suffix}"
+        ]
+        if extract_frames:
+            # The frames are a second output of the same command, so the scene
+            # is demuxed and decoded once for both the segment and its frames
+            log(f"Extracting frames from scene {i} (every {frame_interval}s)")
+            if cut_start != start_time:
+                # Decoded frames can still start exactly at the scene
+                cmd += ['-ss', str(start_time - cut_start)]
+            cmd += frames_output_args(end_time - start_time, frame_interval,
+                                      scene_frames_output(output_dir, filename, i, tile, frame_format), tile,
+                                      frame_format)
+        
+        subprocess.run(cmd, check=True)
+    
+    run_parallel(extract_one, enumerate(scenes, 1), jobs)
 
-def extract_scene_frames(start_time, end_time, scene_num, filename, input_file, output_dir, frame_interval):
-    """Extract individual frames from a scene"""
-    frames_dir = output_dir / "frames" / f"scene_{scene_num:03d}"
-    frames_dir.mkdir(parents=True, exist_ok=True)
+def frame_filter(frame_interval, tile=None):
+    """Video filter sampling one frame every frame_interval seconds, optionally tiled"""
+    if tile:
+        return f'fps=1/{frame_interval},tile={tile}'
+    return f'fps=1/{frame_interval}'
+
+def scene_frames_output(output_dir, filename, scene_num, tile=None, frame_format='jpg'):
+    """Return the image2 output pattern for a scene's frames"""
+    if tile:
+        # Contact sheets are few enough to share one directory
+        return output_dir / "frames" / f"{filename}_scene{scene_num}_sheet%03d.{frame_format}"
+    return output_dir / "frames" / f"scene_{scene_num:03d}" / f"{filename}_scene{scene_num}_%04d.{frame_format}"
+
+def create_frame_dirs(output_dir, scene_count, tile=None):
+    """Create the frames directory tree for all scenes before extraction starts"""
+    frames_root = output_dir / "frames"
+    frames_root.mkdir(parents=True, exist_ok=True)
+    if not tile:
+        for i in range(1, scene_count + 1):
+            (frames_root / f"scene_{i:03d}").mkdir(exist_ok=True)
+
+def extract_scene_frames(start_time, end_time, scene_num, filename, input_file, output_dir, frame_interval,
+                         tile=None, hwaccel=None, frame_format='jpg'):
+    """Extract individual frames (or contact sheets) from a scene"""
+    output_pattern = scene_frames_output(output_dir, filename, scene_num, tile, frame_format)
     
     duration = end_time - start_time
     log(f"Extracting frames from scene {scene_num} (every {frame_interval}s)")
     
+    # Input seeking jumps to the keyframe before start_time and only decodes
+    # from there; when transcoding FFmpeg then drops the frames before
+    # start_time itself, so no output-side -ss refinement is needed
     cmd = [
-        'ffmpeg', '-y', '-loglevel', 'warning',
+        'ffmpeg', '-y', '-loglevel', 'warning', *hwaccel_args(hwaccel),
         '-ss', str(start_time),
         '-i', str(input_file),
+        *frames_output_args(duration, frame_interval, output_pattern, tile, frame_format)
+    ]
+    
+    subprocess.run(cmd, check=True)
+
+def frames_output_args(duration, frame_interval, output_pattern, tile=None, frame_format='jpg'):
+    """Output options writing a scene's sampled frames (or contact sheets) to output_pattern"""
+    return [
         '-t', str(duration),
-        '-vf', f'fps=1/{frame_interval}',
-        '-q:v', '2',
-        str(frames_dir / f"{filename}_scene{scene_num}_%04d.jpg")
+        '-vf', frame_filter(frame_interval, tile),
+        *FRAME_CODEC_ARGS[frame_format],
+        '-threads', str(FFMPEG_THREADS_PER_JOB),
+        str(output_pattern)
+    ]
+
+def extract_frames_single_pass(scenes, input_file, output_dir, frame_interval, tile=None, hwaccel=None,
+                               frame_format='jpg'):
+    """Extract frames for every scene with a single FFmpeg decode pass"""
+    log(f"Extracting frames from {len(scenes)} night scenes in a single pass...")
+    filename = Path(input_file).stem.replace('%', '%%')
+    
+    # split fans the decoded video out to one select+fps branch per scene,
+    # and each branch writes straight into its scene's frames directory
+    graph = [f"[0:v]split={len(scenes)}" + ''.join(f'[s{i}]' for i in range(1, len(scenes) + 1))]
+    outputs = []
+    for i, (start_time, end_time) in enumerate(scenes, 1):
+        graph.append(f"[s{i}]select='between(t,{start_time},{end_time})',{frame_filter(frame_interval, tile)}[f{i}]")
+        outputs += [
+            '-map', f'[f{i}]',
+            '-vsync', '0',
+            *FRAME_CODEC_ARGS[frame_format],
+            str(scene_frames_output(output_dir, filename, i, tile, frame_format))
+        ]
+    
+    # Input-side -to stops the decode after the last scene instead of at EOF
+    last_end = max(end_time for _, end_time in scenes)
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'warning', *hwaccel_args(hwaccel),
+        '-to', str(last_end), '-i', str(input_file),
+        '-filter_complex', ';'.join(graph),
+        *outputs
     ]
     
     subprocess.run(cmd, check=True)
 
-def extract_frames_only(scenes, input_file, output_dir, frame_interval):
+def extract_frames_only(scenes, input_file, output_dir, frame_interval, single_pass=False, tile=None, jobs=None,
+                        hwaccel=None, frame_format='jpg'):
     """Extract only frames (no video segments)"""
     if not scenes:
         log("No scenes to extract frames from")
         return
     
+    create_frame_dirs(output_dir, len(scenes), tile)
+    
+    if single_pass and 1 < len(scenes) <= MAX_SINGLE_PASS_SCENES:
+        extract_frames_single_pass(scenes, input_file, output_dir, frame_interval, tile, hwaccel, frame_format)
+        return
+    
     log("Extracting frames from night scenes...")
     filename = Path(input_file).stem
     
-    for i, (start_time, end_time) in enumerate(scenes, 1):
+    def extract_one(scene):
+        i, (start_time, end_time) = scene
         extract_scene_frames(start_time, end_time, i, filename, 
-                           input_file, output_dir, frame_interval)
+                           input_file, output_dir, frame_interval, tile, hwaccel, frame_format)
+    
+    run_parallel(extract_one, enumerate(scenes, 1), jobs)
 
-def generate_report(scenes, input_file, output_dir, luma_threshold, min_duration):
-    """Generate detection report"""
+def generate_report(scenes, input_file, output_dir, luma_threshold, min_duration, report_format='text',
+                    luma_percentile=None):
+    """Generate detection report, luma_percentile being set when the threshold was adaptive"""
+    if report_format == 'json':
+        generate_json_report(scenes, input_file, output_dir, luma_threshold, min_duration, luma_percentile)
+        return
+    
     report_file = output_dir / "night_detection_report.txt"
     
     with open(report_file, 'w') as f:
@@ -628,7 +1182,11 @@ def generate_report(scenes, input_file, output_dir, luma_threshold, min_duration
         f.write("============================\n")
         f.write(f"Generated: {datetime.now()}\n")
         f.write(f"Input file: {input_file}\n")
-        f.write(f"Luminance threshold: {luma_threshold}\n")
+        f.write(f"Luminance threshold: {luma_threshold:g}\n")
+        if luma_percentile is None:
+            f.write("Luminance mode: fixed\n")
+        else:
+            f.write(f"Luminance mode: adaptive ({luma_percentile:g}th percentile)\n")
         f.write(f"Minimum duration: {min_duration}s\n")
         f.write("\n")
         
@@ -646,6 +1204,48 @@ def generate_report(scenes, input_file, output_dir, luma_threshold, min_duration
     
     log(f"Report generated: {report_file}")
 
+def generate_json_report(scenes, input_file, output_dir, luma_threshold, min_duration, luma_percentile=None):
+    """Generate a machine-readable detection report"""
+    report_file = output_dir / "night_detection_report.json"
+    
+    report = {
+        'generated': datetime.now().isoformat(),
+        'input_file': str(input_file),
+        'luma_threshold': luma_threshold,
+        'luma_mode': 'fixed' if luma_percentile is None else 'adaptive',
+        'luma_percentile': luma_percentile,
+        'min_duration': min_duration,
+        'scenes': [
+            {'scene': i, 'start': start, 'end': end, 'duration': end - start}
+            for i, (start, end) in enumerate(scenes, 1)
+        ],
+    }
+    
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    log(f"Report generated: {report_file}")
+
+def tile_layout(value):
+    """argparse type for a COLSxROWS tile layout"""
+    if not re.fullmatch(r'[1-9][0-9]*x[1-9][0-9]*', value):
+        raise argparse.ArgumentTypeError(f"invalid tile layout '{value}', expected COLSxROWS such as 8x8")
+    return value
+
+def luma_setting(value):
+    """argparse type for a 0-255 luma threshold or 'adaptive'"""
+    if value == 'adaptive':
+        return value
+    if not value.isdigit() or int(value) > 255:
+        raise argparse.ArgumentTypeError(f"invalid luma threshold '{value}', expected 0-255 or 'adaptive'")
+    return int(value)
+
+def job_count(value):
+    """argparse type for a positive number of parallel FFmpeg jobs"""
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError(f"invalid job count '{value}', expected a positive integer")
+    return int(value)
+
 def main():
     # Parse arguments first to check if OCR is needed
     parser = argparse.ArgumentParser(
@@ -665,13 +1265,34 @@ Examples:
     parser.add_argument('-o', '--out', default='./night_scenes', help='Output directory')
     parser.add_argument('--preset', choices=list(PRESETS.keys()), 
                        help='Use predefined settings (overrides individual options)')
-    parser.add_argument('-l', '--luma', type=int, help='Luminance threshold (0-255)')
+    parser.add_argument('-l', '--luma', type=luma_setting,
+                       help="Luminance threshold (0-255), or 'adaptive' to derive it from the video")
+    parser.add_argument('--luma-percentile', type=float, default=15.0,
+                       help='Percentile of frame luma used by --luma adaptive (default: 15)')
     parser.add_argument('-d', '--duration', type=float, help='Minimum scene duration (seconds)')
+    parser.add_argument('--analysis-fps', type=float, default=8.0,
+                       help='Frames per second sampled for analysis, 0 for every frame (default: 8)')
     parser.add_argument('-v', '--extract-videos', action='store_true', help='Extract video segments')
     parser.add_argument('--no-frames', action='store_true', help='Skip frame extraction (extract videos only)')
     parser.add_argument('-i', '--interval', type=float, help='Frame extraction interval')
     parser.add_argument('-q', '--quality', type=int, default=2, help='Video quality (1-31)')
     parser.add_argument('--format', default='mp4', help='Output format')
+    parser.add_argument('--copy', '--stream-copy', action='store_true',
+                       help='Stream copy video segments instead of re-encoding (fast, cuts at keyframes)')
+    parser.add_argument('--single-pass', action='store_true',
+                       help='Extract all video segments/frames in one FFmpeg decode pass (faster when scenes are dense)')
+    parser.add_argument('--frame-format', choices=list(FRAME_CODEC_ARGS), default='jpg',
+                       help='Image format for extracted frames (default: jpg)')
+    parser.add_argument('--tile', type=tile_layout, metavar='COLSxROWS',
+                       help='Pack extracted frames into contact sheets of COLSxROWS (e.g. 8x8)')
+    parser.add_argument('--hwaccel', choices=['auto', 'cuda', 'vaapi', 'qsv', 'videotoolbox', 'd3d11va'],
+                       help='Decode with this FFmpeg hardware accelerator (not used by --audio-correlation analysis)')
+    parser.add_argument('--gpu-decode', action='store_true',
+                       help='Decode and downscale analysis frames on an NVIDIA GPU (NVDEC, implies --hwaccel cuda)')
+    parser.add_argument('--hwenc', choices=['nvenc', 'qsv'],
+                       help='Encode video segments with a hardware H.264 encoder instead of libx264')
+    parser.add_argument('-j', '--jobs', type=job_count,
+                       help='Number of scenes to extract in parallel (default: CPU count / 2)')
     parser.add_argument('--establishing-shots', action='store_true', 
                        help='[EXPERIMENTAL] Focus on wide establishing shots rather than close-ups')
     parser.add_argument('--rich-analysis', action='store_true',
@@ -688,6 +1309,12 @@ Examples:
                        help='Skip opening and closing credits using text detection')
     parser.add_argument('--credits-sample-interval', type=int,
                        help='Sampling interval for credits detection (seconds)')
+    parser.add_argument('--report-format', choices=['text', 'json'], default='text',
+                       help='Write the detection report as text or JSON (default: text)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-run the brightness analysis and credits detection even if cached results exist')
+    parser.add_argument('--debug', action='store_true',
+                       help='Save raw FFmpeg analysis output to brightness_analysis.txt')
     
     args = parser.parse_args()
     
@@ -722,14 +1349,29 @@ Examples:
         if args.credits_sample_interval is None:
             args.credits_sample_interval = 30
     
-    # Check dependencies based on features requested
-    check_dependencies(require_ocr=args.skip_credits)
+    if not 0 < args.luma_percentile < 100:
+        print(f"Error: --luma-percentile must be between 0 and 100, got {args.luma_percentile}")
+        return 1
+    
+    if args.analysis_fps < 0:
+        print(f"Error: --analysis-fps must not be negative, got {args.analysis_fps}")
+        return 1
     
     # Default behavior: extract frames only
     # Use flags to modify: -v for videos, --no-frames to skip frames
     extract_frames = not args.no_frames
     extract_videos = args.extract_videos
     
+    # Check dependencies based on features requested
+    check_dependencies(require_ocr=args.skip_credits)
+    
+    if args.gpu_decode:
+        if cuda_decode_available():
+            args.hwaccel = args.hwaccel or 'cuda'
+        else:
+            log("No usable CUDA device for FFmpeg, decoding on the CPU")
+            args.gpu_decode = False
+    
     # Validate input file
     input_file = Path(args.file)
     if not input_file.exists():
@@ -747,26 +1389,62 @@ Examples:
         extract_options.append("videos")
     if extract_frames:
         extract_options.append("frames")
-    log(f"Will extract: {', '.join(extract_options)}")
+    log(f"Will extract: {', '.join(extract_options) or 'nothing (report only)'}")
     
+    child_processes = ExitStack()
     try:
         # Get video info
         duration, fps = get_video_info(input_file)
         
-        # Analyze brightness (and possibly motion/edges for establishing shots)
-        analysis_file = analyze_brightness(input_file, output_dir, args.establishing_shots, args.rich_analysis, args.audio_correlation)
+        # Reruns on the same file reuse the analysis output of an earlier run;
+        # only the basic and rich passes threshold luma inside FFmpeg
+        mode = analysis_mode(args.establishing_shots, args.rich_analysis, args.audio_correlation)
+        cache_file = analysis_cache_file(output_dir, input_file, mode, args.analysis_fps)
+        analysis_luma = float('inf') if args.luma == 'adaptive' else args.luma
+        cache_threshold = analysis_luma if mode in ('basic', 'rich') else float('inf')
+        cached_lines = None if args.no_cache else load_analysis_cache(cache_file, analysis_luma)
+        
+        # OCR is the most expensive stage, so its result is cached separately
+        # and survives reruns with a different threshold or analysis mode
+        text_regions = None
+        if args.skip_credits:
+            credits_cache = credits_cache_file(output_dir, input_file, args.credits_sample_interval)
+            if not args.no_cache:
+                text_regions = load_credits_cache(credits_cache)
+        
+        # Credits OCR shares the analysis decode unless the analysis is
+        # cached and there is no decode to share
+        fuse_text_detection = args.skip_credits and text_regions is None and cached_lines is None
+        text_analysis_file = output_dir / "text_analysis.txt" if fuse_text_detection else None
         
-        # Extract night timestamps
-        timestamps = extract_night_timestamps(analysis_file, args.luma, args.establishing_shots, 
-                                            args.audio_correlation, args.quiet_threshold, 
-                                            args.loud_threshold, args.audio_mode)
+        if cached_lines is not None:
+            log(f"Reusing cached analysis from {cache_file}")
+            timestamps, luma_threshold = extract_night_timestamps(cached_lines, args.luma, args.establishing_shots, 
+                                                args.audio_correlation, args.quiet_threshold, 
+                                                args.loud_threshold, args.audio_mode, args.luma_percentile)
+        else:
+            # Analyze brightness (and possibly motion/edges for establishing shots)
+            process = analyze_brightness(input_file, args.luma, args.establishing_shots, args.rich_analysis, args.audio_correlation,
+                                         text_analysis_file, args.credits_sample_interval, args.hwaccel, duration,
+                                         args.gpu_decode, args.analysis_fps)
+            child_processes.callback(stop_process, process)
+            analysis_lines = cache_lines(process.stdout, cache_file, cache_threshold)
+            if args.debug:
+                analysis_lines = tee_lines(analysis_lines, output_dir / "brightness_analysis.txt")
+            
+            # Extract night timestamps while FFmpeg is still running
+            timestamps, luma_threshold = extract_night_timestamps(analysis_lines, args.luma, args.establishing_shots, 
+                                                args.audio_correlation, args.quiet_threshold, 
+                                                args.loud_threshold, args.audio_mode, args.luma_percentile)
+            finish_analysis(process)
+            os.replace(cache_file.with_suffix('.tmp'), cache_file)
         
         if not timestamps:
             log("No dark frames found. Try increasing --luma threshold.")
             return 0
         
         # Create scene segments
-        scenes = create_scene_segments(timestamps, args.duration)
+        scenes = create_scene_segments(timestamps, args.duration, args.analysis_fps)
         
         if not scenes:
             log("No scenes meet minimum duration requirement.")
@@ -774,30 +1452,63 @@ Examples:
         
         # Filter out credits if requested
         if args.skip_credits:
-            text_regions = detect_text_regions(input_file, output_dir, args.credits_sample_interval)
+            if text_regions is not None:
+                log(f"Reusing cached credit regions from {credits_cache}")
+            else:
+                if fuse_text_detection:
+                    text_regions = load_text_regions(text_analysis_file, args.credits_sample_interval, duration)
+                elif not scenes_reach_credits(scenes, duration, args.credits_sample_interval):
+                    log("No scenes near the opening or closing credits, skipping text detection")
+                else:
+                    text_regions = detect_text_regions(input_file, args.credits_sample_interval, args.hwaccel,
+                                                       duration, args.gpu_decode)
+                if text_regions is not None:
+                    save_credits_cache(credits_cache, text_regions)
             scenes = filter_credits_from_scenes(scenes, text_regions, duration)
             
             if not scenes:
                 log("No scenes remain after filtering credits.")
                 return 0
         
-        # Extract video segments and/or frames
-        if extract_videos:
-            extract_video_segments(scenes, input_file, output_dir, args.quality, 
-                                 args.format, extract_frames, args.interval)
-        elif extract_frames:
-            # Extract frames only (without videos)
-            extract_frames_only(scenes, input_file, output_dir, args.interval)
+        # Dense scenes get their frames in a single pass even without
+        # --single-pass. Video extraction keeps its per-scene processes,
+        # which write segment and frames from one decode of each scene
+        single_pass = args.single_pass
+        coverage = sum(end - start for start, end in scenes) / duration if duration else 0
+        if (not single_pass and not extract_videos and coverage > SINGLE_PASS_COVERAGE
+                and 1 < len(scenes) <= MAX_SINGLE_PASS_SCENES):
+            log(f"Scenes cover {coverage:.0%} of the video, extracting frames in a single pass")
+            single_pass = True
         
-        # Generate report
-        generate_report(scenes, input_file, output_dir, args.luma, args.duration)
+        # The report only needs the final scene list, so it is written on a
+        # background thread while FFmpeg extracts
+        report_percentile = args.luma_percentile if args.luma == 'adaptive' else None
+        with ThreadPoolExecutor(max_workers=1) as report_executor:
+            report = report_executor.submit(generate_report, scenes, input_file, output_dir, luma_threshold,
+                                            args.duration, args.report_format, report_percentile)
+            
+            # Extract video segments and/or frames
+            if extract_videos:
+                extract_video_segments(scenes, input_file, output_dir, args.quality, 
+                                     args.format, extract_frames, args.interval,
+                                     single_pass, args.copy, args.tile, args.jobs, args.hwaccel, args.hwenc,
+                                     args.frame_format)
+            elif extract_frames:
+                # Extract frames only (without videos)
+                extract_frames_only(scenes, input_file, output_dir, args.interval, single_pass, args.tile, args.jobs,
+                                    args.hwaccel, args.frame_format)
+        report.result()
         
         log("Night scene detection completed successfully!")
         log(f"Output directory: {output_dir}")
         
-    except Exception as e:
+    except (subprocess.SubprocessError, OSError, ValueError, RuntimeError) as e:
         log(f"Error: {e}")
         return 1
+    finally:
+        # An analysis FFmpeg still running here, after an error or Ctrl-C,
+        # would otherwise keep decoding in the background
+        child_processes.close()
     
     return 0
 